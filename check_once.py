@@ -1,14 +1,17 @@
 """Single check script for scheduled runs (e.g., GitHub Actions)."""
+import atexit
+import signal
 import sys
 from config import Config
-from github_client import GitHubClient, GitHubError
+from github_client import GitHubClient, GitHubError, NOT_MODIFIED
 from telegram_client import TelegramClient
 from state_manager import StateManager
 
 def main():
     """Run a single check for all repositories."""
-    # Validate configuration
-    is_valid, errors = Config.validate()
+    # Load and validate configuration
+    cfg = Config.load()
+    is_valid, errors = cfg.validate()
     if not is_valid:
         print("Configuration errors:")
         for error in errors:
@@ -17,25 +20,44 @@ def main():
         sys.exit(1)
     
     # Initialize clients
-    github = GitHubClient(Config.GITHUB_TOKEN)
-    telegram = TelegramClient(Config.TELEGRAM_BOT_TOKEN, Config.TELEGRAM_CHAT_ID)
     state = StateManager()
+    github = GitHubClient(cfg.github_token, etags=state.etags)
+    telegram = TelegramClient(cfg.telegram_bot_token, cfg.telegram_chat_id)
     
-    repos = Config.REPO_NAMES
+    # Persist progress even if the run is cancelled or times out
+    atexit.register(state.flush)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    
+    repos = cfg.repo_names
     total_new = 0
     
     print(f"Checking {len(repos)} repository/repositories...")
-    if Config.AUTHOR_NAME:
-        print(f"Author filter: {Config.AUTHOR_NAME}")
+    if cfg.author_name:
+        print(f"Author filter: {cfg.author_name}")
     print("-" * 50)
     
+    # Fetch all repositories up front; results are processed on this thread
+    fetched = github.fetch_open_issues(repos, author=cfg.author_name)
+    
+    # New issues across all repos, alerted together after the loop: [(repo, issue)]
+    pending = []
+    # Fetch cache of repos with pending alerts, committed once they are sent: {repo: (etag, hash)}
+    deferred = {}
+    
     # Check each repository
     for repo in repos:
         try:
-            issues = github.get_open_issues(
-                repo=repo,
-                author=Config.AUTHOR_NAME
-            )
+            issues = fetched[repo].result()
+            
+            if issues is NOT_MODIFIED:
+                print(f"[{repo}] unchanged (304)")
+                continue
+            
+            # Same issue numbers as last run: nothing to sync or alert
+            issues_hash = state.hash_issue_numbers(issues)
+            if state.is_unchanged(repo, issues_hash):
+                print(f"[{repo}] no change")
+                continue
             
             # Check if this is the first run for this repo (no state exists)
             is_first_run = not state.is_repo_initialized(repo)
@@ -65,28 +87,50 @@ def main():
                     else:
                         print(f"[{repo}] Found {len(new_issues)} new issue(s)!")
                         total_new += len(new_issues)
-                        
-                        # Send alerts for new issues
-                        for issue in new_issues:
-                            issue_number = issue.get("number")
-                            print(f"  Sending alert for issue #{issue_number}...")
-                            
-                            message = telegram.format_issue_alert(issue, repo)
-                            success = telegram.send_message(message)
-                            
-                            if success:
-                                state.mark_notified(repo, issue_number)
-                                print(f"  ✓ Alert sent for issue #{issue_number}")
-                            else:
-                                print(f"  ✗ Failed to send alert for issue #{issue_number}")
+                        pending.extend((repo, issue) for issue in new_issues)
+                        # Hold back the ETag and hash so a run stopped mid-send
+                        # refetches this repo and retries the alerts
+                        deferred[repo] = (state.etags.pop(repo, None), issues_hash)
+                        continue
                 else:
                     print(f"[{repo}] No new issues (checked {len(issues)} total)")
+            
+            state.mark_processed(repo, issues_hash)
                 
         except GitHubError as e:
             print(f"⚠️  [{repo}] Error: {e}")
         except Exception as e:
+            state.reset_fetch_cache(repo)
             print(f"⚠️  [{repo}] Unexpected error: {e}")
     
+    # Send alerts for new issues concurrently, then record the successful ones
+    if pending:
+        print(f"Sending {len(pending)} alert(s)...")
+    failed = set()
+    for (repo, issue), success in zip(pending, telegram.send_issue_alerts(pending)):
+        issue_number = issue.get("number")
+        if success:
+            state.mark_notified(repo, issue_number)
+            print(f"  ✓ [{repo}] Alert sent for issue #{issue_number}")
+        else:
+            print(f"  ✗ [{repo}] Failed to send alert for issue #{issue_number}")
+            failed.add(repo)
+    
+    # Commit the fetch cache of repos whose alerts all went out; refetch
+    # the full list of the others next run so their alerts are retried
+    for repo, (etag, issues_hash) in deferred.items():
+        if repo in failed:
+            state.reset_fetch_cache(repo)
+            continue
+        if etag:
+            state.etags[repo] = etag
+        state.mark_processed(repo, issues_hash)
+    
+    # Save all state changes from this run in one write
+    state.flush()
+    github.close()
+    telegram.close()
+    
     print("-" * 50)
     if total_new > 0:
         print(f"✅ Check complete: {total_new} new issue(s) found and alerted")
@@ -1,59 +1,69 @@
 """Configuration management for GitHub issue monitor."""
 import os
-from typing import Optional, List
+import sys
+from dataclasses import dataclass
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+@dataclass(frozen=True)
 class Config:
-    """Application configuration."""
+    """Application configuration, read once from the environment via Config.load()."""
     
     # GitHub settings
-    GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN") or None
-    REPO_NAMES: List[str] = []
-    AUTHOR_NAME: Optional[str] = os.getenv("AUTHOR_NAME") or None
+    github_token: Optional[str]
+    repo_names: Tuple[str, ...]
+    author_name: Optional[str]
     
     # Telegram settings
-    TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
-    TELEGRAM_CHAT_ID: str = os.getenv("TELEGRAM_CHAT_ID", "")
+    telegram_bot_token: str
+    telegram_chat_id: str
     
     # Monitoring settings
-    POLL_INTERVAL: int = int(os.getenv("POLL_INTERVAL", "900"))  # Default 15 minutes
+    poll_interval: int  # Seconds
     
     @classmethod
-    def _parse_repos(cls) -> List[str]:
-        """Parse repository names from environment variable."""
-        repo_str = os.getenv("REPO_NAMES", "") or os.getenv("REPO_NAME", "")
+    def load(cls) -> "Config":
+        """Build the configuration from environment variables."""
+        return cls(
+            github_token=os.getenv("GITHUB_TOKEN") or None,
+            repo_names=cls._parse_repos(os.getenv("REPO_NAMES", "") or os.getenv("REPO_NAME", "")),
+            author_name=os.getenv("AUTHOR_NAME") or None,
+            telegram_bot_token=os.getenv("TELEGRAM_BOT_TOKEN", ""),
+            telegram_chat_id=os.getenv("TELEGRAM_CHAT_ID", ""),
+            poll_interval=int(os.getenv("POLL_INTERVAL", "900")),  # Default 15 minutes
+        )
+    
+    @staticmethod
+    def _parse_repos(repo_str: str) -> Tuple[str, ...]:
+        """Parse repository names from environment variable value."""
         if not repo_str:
-            return []
+            return ()
         
         # Support comma-separated or newline-separated repos
         repos = []
         for repo in repo_str.replace("\n", ",").split(","):
             repo = repo.strip()
             if repo:
-                repos.append(repo)
-        return repos
+                # Interned so state keys and lookups share one string object
+                repos.append(sys.intern(repo))
+        return tuple(repos)
     
-    @classmethod
-    def validate(cls) -> tuple[bool, list[str]]:
+    def validate(self) -> tuple[bool, list[str]]:
         """Validate configuration and return (is_valid, errors)."""
         errors = []
         
         # GITHUB_TOKEN is optional (for public repos), but recommended for higher rate limits
         
-        # Parse repos
-        cls.REPO_NAMES = cls._parse_repos()
-        
-        if not cls.REPO_NAMES:
+        if not self.repo_names:
             errors.append("REPO_NAMES or REPO_NAME is required (format: owner/repo or comma-separated: owner1/repo1,owner2/repo2)")
         
-        if not cls.TELEGRAM_BOT_TOKEN:
+        if not self.telegram_bot_token:
             errors.append("TELEGRAM_BOT_TOKEN is required")
         
-        if not cls.TELEGRAM_CHAT_ID:
+        if not self.telegram_chat_id:
             errors.append("TELEGRAM_CHAT_ID is required")
         
         return len(errors) == 0, errors
-
@@ -1,7 +1,10 @@
 """GitHub API client for fetching issues."""
+import threading
 import requests
-from typing import Optional, List, Dict
-from config import Config
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, List, Dict, Set, Union
 
 
 class GitHubError(Exception):
@@ -9,36 +12,101 @@ class GitHubError(Exception):
     pass
 
 
+# Returned by get_open_issues() when GitHub answers 304 Not Modified
+NOT_MODIFIED = object()
+
+
 class GitHubClient:
     """Client for interacting with GitHub API."""
     
     BASE_URL = "https://api.github.com"
     
-    def __init__(self, token: Optional[str] = None):
-        """Initialize GitHub client with optional API token."""
+    # Cap on in-flight requests to stay clear of GitHub's secondary rate limits
+    MAX_CONCURRENT_REQUESTS = 10
+    
+    # Fields requested per issue in GraphQL bulk queries
+    GRAPHQL_ISSUE_FIELDS = """
+        number
+        title
+        url
+        body
+        createdAt
+        author { login }
+        labels(first: 5) { nodes { name } }
+    """
+    
+    def __init__(self, token: Optional[str] = None, etags: Optional[Dict[str, str]] = None):
+        """
+        Initialize GitHub client with optional API token.
+        
+        Args:
+            token: Optional GitHub API token
+            etags: Optional {repo: etag} cache used for conditional requests.
+                Updated in place, so pass StateManager.etags to persist it.
+        """
         self.token = token
+        self.etags = etags if etags is not None else {}
+        self._request_slots = threading.Semaphore(self.MAX_CONCURRENT_REQUESTS)
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
         }
         if token:
             self.headers["Authorization"] = f"token {token}"
+        
+        # One pooled session so pages and repos reuse TCP/TLS connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        )
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retries)
+        )
+    
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        self.session.close()
+    
+    def __enter__(self) -> "GitHubClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
     def get_open_issues(
         self,
         repo: str,
         author: Optional[str] = None,
-        state: str = "open"
-    ) -> List[Dict]:
+        state: str = "open",
+        since: Optional[str] = None,
+        known: Optional[Set[int]] = None
+    ) -> Union[List[Dict], object]:
         """
         Fetch open issues from a repository, optionally filtered by author.
         
+        Sends If-None-Match with the cached ETag for the repo. A 304 response
+        doesn't count against the rate limit and means the issue list is
+        unchanged since the ETag was stored. ETags are only cached when the
+        whole list fits on a single page.
+        
+        Passing since and/or known turns this into an incremental fetch that
+        only returns issues updated since the timestamp, and stops paging at
+        the first page whose issues are all in known. The result is then not
+        the full open-issue list, so it must not be used for state re-syncs.
+        
         Args:
             repo: Repository name in format 'owner/repo'
             author: Optional GitHub username to filter by
             state: Issue state (default: 'open')
+            since: Optional ISO 8601 timestamp; only issues updated after it
+            known: Optional set of issue numbers already seen for this repo
         
         Returns:
-            List of issue dictionaries
+            List of issue dictionaries, or NOT_MODIFIED on a 304 response
         """
         url = f"{self.BASE_URL}/repos/{repo}/issues"
         params = {
@@ -47,6 +115,10 @@ class GitHubClient:
             "sort": "created",
             "direction": "desc"
         }
+        if since:
+            params["since"] = since
+        # Conditional requests only pay off when the query is the same every run
+        use_etag = state == "open" and since is None
         
         all_issues = []
         page = 1
@@ -54,7 +126,15 @@ class GitHubClient:
         try:
             while True:
                 params["page"] = page
-                response = requests.get(url, headers=self.headers, params=params, timeout=30)
+                headers = {}
+                etag = self.etags.get(repo) if page == 1 and use_etag else None
+                if etag:
+                    headers["If-None-Match"] = etag
+                with self._request_slots:
+                    response = self.session.get(url, headers=headers, params=params, timeout=30)
+                
+                if response.status_code == 304:
+                    return NOT_MODIFIED
                 
                 # Handle different HTTP status codes gracefully
                 if response.status_code == 404:
@@ -90,6 +170,14 @@ class GitHubClient:
                         f"GitHub API error ({response.status_code}): {error_msg}"
                     )
                 
+                has_next_page = "next" in response.links
+                if page == 1 and use_etag:
+                    # ETags only describe a single page, so skip caching when paginated
+                    if response.headers.get("ETag") and not has_next_page:
+                        self.etags[repo] = response.headers["ETag"]
+                    else:
+                        self.etags.pop(repo, None)
+                
                 issues = response.json()
                 if not issues:
                     break
@@ -103,8 +191,12 @@ class GitHubClient:
                 
                 all_issues.extend(issues)
                 
-                # Check if there are more pages
-                if len(issues) < 100:
+                # Newest first: once a whole page is already known, so are later pages
+                if known and issues and all(issue["number"] in known for issue in issues):
+                    break
+                
+                # Check if there are more pages (counting after filtering would stop early)
+                if not has_next_page:
                     break
                 
                 page += 1
@@ -116,10 +208,175 @@ class GitHubClient:
         except requests.exceptions.RequestException as e:
             raise GitHubError(f"Network error while fetching issues: {str(e)}")
     
+    def fetch_open_issues(
+        self,
+        repos: List[str],
+        author: Optional[str] = None,
+        since: Optional[Dict[str, str]] = None,
+        known: Optional[Dict[str, Set[int]]] = None
+    ) -> Dict[str, Future]:
+        """
+        Fetch open issues for several repositories concurrently.
+        
+        Tries the single GraphQL request first, then fetches the repos it did
+        not cover with get_open_issues() on a thread pool. Results are returned
+        as futures so per-repo errors are raised by Future.result() and can be
+        handled one repo at a time.
+        
+        Args:
+            repos: Repository names in format 'owner/repo'
+            author: Optional GitHub username to filter by
+            since: Optional {repo: timestamp} for incremental fetches
+            known: Optional {repo: issue numbers} for incremental fetches
+        
+        Returns:
+            Dictionary mapping repo name to a Future of get_open_issues()'s result
+        """
+        since = since or {}
+        known = known or {}
+        try:
+            prefetched = self.get_open_issues_bulk(repos, author, since=since)
+        except Exception as e:
+            # The REST fallback reports the underlying problem per repo
+            print(f"⚠️  Bulk fetch failed, falling back to per-repo requests: {e}")
+            prefetched = {}
+        
+        futures = {}
+        for repo, issues in prefetched.items():
+            futures[repo] = Future()
+            futures[repo].set_result(issues)
+        
+        remaining = [repo for repo in repos if repo not in prefetched]
+        if remaining:
+            executor = ThreadPoolExecutor(max_workers=min(len(remaining), self.MAX_CONCURRENT_REQUESTS))
+            for repo in remaining:
+                futures[repo] = executor.submit(
+                    self.get_open_issues,
+                    repo=repo,
+                    author=author,
+                    since=since.get(repo),
+                    known=known.get(repo)
+                )
+            # Queued fetches still run; don't block the caller on all of them
+            executor.shutdown(wait=False)
+        return futures
+    
+    def get_open_issues_bulk(
+        self,
+        repos: List[str],
+        author: Optional[str] = None,
+        since: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch open issues for several repositories in a single request.
+        
+        Uses one aliased GraphQL query instead of paging the REST API per repo.
+        GraphQL requires authentication, so without a token nothing is fetched.
+        Repos that could not be fetched completely (errors, more than 100
+        matching issues) are left out of the result; callers should fall back
+        to get_open_issues() for those to get the detailed error handling.
+        
+        Args:
+            repos: Repository names in format 'owner/repo'
+            author: Optional GitHub username to filter by
+            since: Optional {repo: ISO 8601 timestamp}; only issues updated after it
+        
+        Returns:
+            Dictionary mapping repo name to a list of REST-shaped issue dicts
+        """
+        if not self.token or not repos:
+            return {}
+        return self.graphql_bulk_open_issues(repos, author, since)
+    
+    def graphql_bulk_open_issues(
+        self,
+        repos: List[str],
+        author: Optional[str] = None,
+        since: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List[Dict]]:
+        """Run the aliased GraphQL query behind get_open_issues_bulk()."""
+        since = since or {}
+        variables = {"author": author}
+        declarations = ["$author: String"]
+        selections = []
+        for i, repo in enumerate(repos):
+            owner, _, name = repo.partition("/")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+            variables[f"s{i}"] = since.get(repo)
+            declarations += [f"$o{i}: String!", f"$n{i}: String!", f"$s{i}: DateTime"]
+            selections.append(
+                f"r{i}: repository(owner: $o{i}, name: $n{i}) {{\n"
+                f"  issues(states: OPEN, first: 100, filterBy: {{createdBy: $author, since: $s{i}}},\n"
+                f"         orderBy: {{field: CREATED_AT, direction: DESC}}) {{\n"
+                f"    pageInfo {{ hasNextPage }}\n"
+                f"    nodes {{ {self.GRAPHQL_ISSUE_FIELDS} }}\n"
+                f"  }}\n"
+                f"}}"
+            )
+        query = f"query({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}"
+        
+        try:
+            with self._request_slots:
+                response = self.session.post(
+                    f"{self.BASE_URL}/graphql",
+                    json={"query": query, "variables": variables},
+                    timeout=30
+                )
+        except requests.exceptions.Timeout:
+            raise GitHubError("Request timeout while fetching issues via GraphQL. Please try again later.")
+        except requests.exceptions.RequestException as e:
+            raise GitHubError(f"Network error while fetching issues: {str(e)}")
+        
+        if response.status_code == 401:
+            raise GitHubError(
+                f"Authentication failed. "
+                f"Please check your GitHub token is valid and has the correct permissions."
+            )
+        elif not response.ok:
+            try:
+                error_msg = response.json().get("message", response.text)
+            except (ValueError, AttributeError):
+                # Gateway errors come back as HTML pages, not JSON
+                error_msg = response.text
+            raise GitHubError(
+                f"GitHub GraphQL error ({response.status_code}): {error_msg}"
+            )
+        
+        try:
+            # Partial failures (e.g. one repo not found) come back as null entries
+            data = response.json().get("data") or {}
+            results = {}
+            for i, repo in enumerate(repos):
+                repository = data.get(f"r{i}")
+                if not repository:
+                    continue
+                issues = repository["issues"]
+                if issues["pageInfo"]["hasNextPage"]:
+                    continue
+                results[repo] = [self._normalize_graphql_issue(node) for node in issues["nodes"]]
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise GitHubError(f"Unexpected GraphQL response: {str(e)}")
+        return results
+    
+    @staticmethod
+    def _normalize_graphql_issue(node: Dict) -> Dict:
+        """Convert a GraphQL issue node to the REST issue dict shape."""
+        return {
+            "number": node["number"],
+            "title": node["title"],
+            "html_url": node["url"],
+            "body": node.get("body") or "",
+            "created_at": node["createdAt"],
+            # Deleted accounts are returned as a null author
+            "user": {"login": (node.get("author") or {}).get("login", "ghost")},
+            "labels": [{"name": label["name"]} for label in node["labels"]["nodes"]],
+        }
+    
     def get_issue(self, repo: str, issue_number: int) -> Dict:
         """Get a specific issue by number."""
         url = f"{self.BASE_URL}/repos/{repo}/issues/{issue_number}"
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url, timeout=30)
         response.raise_for_status()
         return response.json()
 
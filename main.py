@@ -1,17 +1,29 @@
 """Main monitoring script for GitHub issues."""
+import atexit
+import signal
 import time
 import sys
+from datetime import datetime, timedelta, timezone
 from config import Config
-from github_client import GitHubClient, GitHubError
+from github_client import GitHubClient, GitHubError, NOT_MODIFIED
 from telegram_client import TelegramClient
 from state_manager import StateManager
-from token_validator import validate_token, check_private_repo_access
+from token_validator import validate_token, check_many_private_repo_access
+
+# Overlap between incremental fetches, covering clock skew and API lag
+SINCE_OVERLAP = timedelta(minutes=5)
+
+
+def check_timestamp() -> str:
+    """Return the 'since' value to store for a fetch starting now."""
+    return (datetime.now(timezone.utc) - SINCE_OVERLAP).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def main():
     """Main monitoring loop."""
-    # Validate configuration
-    is_valid, errors = Config.validate()
+    # Load and validate configuration
+    cfg = Config.load()
+    is_valid, errors = cfg.validate()
     if not is_valid:
         print("Configuration errors:")
         for error in errors:
@@ -20,24 +32,28 @@ def main():
         sys.exit(1)
     
     # Initialize clients
-    github = GitHubClient(Config.GITHUB_TOKEN)
-    telegram = TelegramClient(Config.TELEGRAM_BOT_TOKEN, Config.TELEGRAM_CHAT_ID)
     state = StateManager()
+    github = GitHubClient(cfg.github_token, etags=state.etags)
+    telegram = TelegramClient(cfg.telegram_bot_token, cfg.telegram_chat_id)
     
-    repos = Config.REPO_NAMES
-    poll_interval_minutes = Config.POLL_INTERVAL // 60
+    # Persist progress when the process is stopped (Ctrl+C, SIGTERM from the host)
+    atexit.register(state.flush)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    
+    repos = cfg.repo_names
+    poll_interval_minutes = cfg.poll_interval // 60
     
     print(f"Starting GitHub issue monitor...")
     print(f"Repositories ({len(repos)}): {', '.join(repos)}")
-    if Config.AUTHOR_NAME:
-        print(f"Author filter: {Config.AUTHOR_NAME}")
-    print(f"Poll interval: {poll_interval_minutes} minutes ({Config.POLL_INTERVAL} seconds)")
-    print(f"Telegram chat ID: {Config.TELEGRAM_CHAT_ID}")
+    if cfg.author_name:
+        print(f"Author filter: {cfg.author_name}")
+    print(f"Poll interval: {poll_interval_minutes} minutes ({cfg.poll_interval} seconds)")
+    print(f"Telegram chat ID: {cfg.telegram_chat_id}")
     
     # Validate token if provided
-    if Config.GITHUB_TOKEN:
+    if cfg.github_token:
         print(f"GitHub authentication: Enabled")
-        is_valid, token_info = validate_token(Config.GITHUB_TOKEN)
+        is_valid, token_info = validate_token(cfg.github_token)
         if is_valid:
             scopes = token_info.get("scopes", [])
             has_repo_scope = token_info.get("has_repo_scope", False)
@@ -65,10 +81,9 @@ def main():
     print("-" * 50)
     
     # Check access to each repository
-    if Config.GITHUB_TOKEN:
+    if cfg.github_token:
         print("Checking repository access...")
-        for repo in repos:
-            can_access, message = check_private_repo_access(Config.GITHUB_TOKEN, repo)
+        for repo, can_access, message in check_many_private_repo_access(cfg.github_token, repos):
             if can_access:
                 print(f"  ✓ {repo}: {message}")
             else:
@@ -77,12 +92,16 @@ def main():
     
     # Initial check for all repos
     print("Performing initial check for all repositories...")
+    checked_at = check_timestamp()
+    fetched = github.fetch_open_issues(repos, author=cfg.author_name)
     for repo in repos:
         try:
-            issues = github.get_open_issues(
-                repo=repo,
-                author=Config.AUTHOR_NAME
-            )
+            issues = fetched[repo].result()
+            
+            issues_hash = None if issues is NOT_MODIFIED else state.hash_issue_numbers(issues)
+            if issues is NOT_MODIFIED or state.is_unchanged(repo, issues_hash):
+                print(f"  ✓ {repo}: Unchanged since last check (already initialized)")
+                continue
             
             # Check if this is the first run for this repo
             is_first_run = not state.is_repo_initialized(repo)
@@ -95,13 +114,22 @@ def main():
                     print(f"  ✓ {repo}: First run - marking {len(issues)} existing issue(s) as notified (no alerts)")
                 # Sync state with current issues (don't alert on startup)
                 state.sync_state_with_current_issues(repo, issues)
+                # Otherwise keep the previous check time so issues opened while
+                # the monitor was down are still picked up by the first poll
+                state.mark_checked(repo, checked_at)
+                state.mark_processed(repo, issues_hash)
             else:
+                # Not compared against state here; the first poll diffs it.
+                # Drop the ETag just cached so that poll can't get a 304 for this list.
+                state.etags.pop(repo, None)
                 print(f"  ✓ {repo}: Found {len(issues)} open issue(s) (already initialized)")
         except GitHubError as e:
             print(f"  ⚠️  {repo}: {e}")
         except Exception as e:
+            state.reset_fetch_cache(repo)
             print(f"  ⚠️  {repo}: Unexpected error - {e}")
     
+    state.flush()
     print("\nInitial state loaded. Monitoring for new issues...\n")
     
     # Main monitoring loop
@@ -110,44 +138,67 @@ def main():
     
     while True:
         try:
+            # Schedule against a deadline so slow polls don't stretch the interval
+            deadline = time.monotonic() + cfg.poll_interval
             total_new_issues = 0
             successful_repos = 0
             
+            # Fetch all repositories up front; results are processed on this thread.
+            # Only issues updated since each repo's last check are needed here.
+            # Tailing event feeds instead isn't reliable: /issues/events has no
+            # "opened" events, and the /events feed can lag by hours, so events
+            # may show up behind a newer event id that was already consumed.
+            checked_at = check_timestamp()
+            fetched = github.fetch_open_issues(
+                repos,
+                author=cfg.author_name,
+                since=state.last_check_ts,
+                known=state.notified_issues
+            )
+            
+            # New issues across all repos, alerted together after the loop: [(repo, issue)]
+            pending = []
+            # Fetch cache of repos with pending alerts, committed once they are sent: {repo: (etag, hash)}
+            deferred = {}
+            
             # Check each repository
             for repo in repos:
                 try:
                     # Fetch current issues
-                    issues = github.get_open_issues(
-                        repo=repo,
-                        author=Config.AUTHOR_NAME
-                    )
+                    issues = fetched[repo].result()
                     
                     # Reset error counter for this repo on success
                     repo_error_counts[repo] = 0
                     successful_repos += 1
                     
+                    if issues is NOT_MODIFIED:
+                        # ETags are only kept for lists that were diffed, so nothing is new
+                        state.mark_checked(repo, checked_at)
+                        print(f"[{repo}] unchanged (304)")
+                        continue
+                    
+                    # Same issue numbers as last poll: nothing new to alert
+                    issues_hash = state.hash_issue_numbers(issues)
+                    if state.is_unchanged(repo, issues_hash):
+                        print(f"[{repo}] no change")
+                        continue
+                    
                     # Filter to only new issues
                     new_issues = state.get_new_issues(repo, issues)
                     
                     if new_issues:
                         total_new_issues += len(new_issues)
                         print(f"[{repo}] Found {len(new_issues)} new issue(s)!")
-                        
-                        # Send alerts for new issues
-                        for issue in new_issues:
-                            issue_number = issue.get("number")
-                            print(f"  Sending alert for issue #{issue_number}...")
-                            
-                            message = telegram.format_issue_alert(issue, repo)
-                            success = telegram.send_message(message)
-                            
-                            if success:
-                                state.mark_notified(repo, issue_number)
-                                print(f"  ✓ Alert sent for issue #{issue_number}")
-                            else:
-                                print(f"  ✗ Failed to send alert for issue #{issue_number}")
-                    else:
-                        print(f"[{repo}] No new issues (checked {len(issues)} total)")
+                        pending.extend((repo, issue) for issue in new_issues)
+                        # Hold back the ETag and hash and keep the old check time, so a
+                        # monitor stopped mid-send refetches this repo and retries the alerts
+                        deferred[repo] = (state.etags.pop(repo, None), issues_hash)
+                        continue
+                    
+                    print(f"[{repo}] No new issues (checked {len(issues)} updated)")
+                    # Only move 'since' forward once the fetched issues were diffed
+                    state.mark_checked(repo, checked_at)
+                    state.mark_processed(repo, issues_hash)
                     
                 except GitHubError as e:
                     repo_error_counts[repo] += 1
@@ -157,6 +208,7 @@ def main():
                     else:
                         print(f"   ⚠️  Too many errors for {repo} - skipping in future checks")
                 except Exception as e:
+                    state.reset_fetch_cache(repo)
                     repo_error_counts[repo] += 1
                     print(f"⚠️  [{repo}] Unexpected error: {e}")
                     if repo_error_counts[repo] < max_consecutive_errors:
@@ -164,23 +216,61 @@ def main():
                     else:
                         print(f"   ⚠️  Too many errors for {repo} - skipping in future checks")
             
+            # Send alerts for new issues concurrently, then record the successful ones
+            if pending:
+                print(f"Sending {len(pending)} alert(s)...")
+            failed = set()
+            for (repo, issue), success in zip(pending, telegram.send_issue_alerts(pending)):
+                issue_number = issue.get("number")
+                if success:
+                    state.mark_notified(repo, issue_number)
+                    print(f"  ✓ [{repo}] Alert sent for issue #{issue_number}")
+                else:
+                    print(f"  ✗ [{repo}] Failed to send alert for issue #{issue_number}")
+                    failed.add(repo)
+            
+            # Commit the fetch cache of repos whose alerts all went out; refetch
+            # the full list of the others next poll so their alerts are retried
+            for repo, (etag, issues_hash) in deferred.items():
+                if repo in failed:
+                    state.reset_fetch_cache(repo)
+                    continue
+                if etag:
+                    state.etags[repo] = etag
+                state.mark_checked(repo, checked_at)
+                state.mark_processed(repo, issues_hash)
+            
+            # Save all state changes from this poll in one write
+            state.flush()
+            
             # Summary
             if total_new_issues > 0:
                 print(f"\n📊 Summary: {total_new_issues} new issue(s) found across {successful_repos}/{len(repos)} repositories")
             else:
                 print(f"\n📊 Summary: No new issues across {successful_repos}/{len(repos)} repositories")
             
+            # Wait out the rest of the interval before the next check
+            sleep_for = deadline - time.monotonic()
+            
             # Check if all repos are failing
             if successful_repos == 0:
-                print(f"\n❌ All repositories are failing. Waiting {poll_interval_minutes} minutes before retry...")
+                print(f"\n❌ All repositories are failing. Waiting {max(sleep_for, 0) / 60:.1f} minutes before retry...")
             
-            # Wait before next check
-            print(f"\n⏳ Next check in {poll_interval_minutes} minutes...\n")
-            time.sleep(Config.POLL_INTERVAL)
+            if sleep_for > 0:
+                print(f"\n⏳ Next check in {sleep_for / 60:.1f} minutes...\n")
+                time.sleep(sleep_for)
+            else:
+                print(
+                    f"\n⚠️  Poll took {-sleep_for:.0f}s longer than the {cfg.poll_interval}s interval. "
+                    f"Consider raising POLL_INTERVAL. Checking again now...\n"
+                )
             
         except KeyboardInterrupt:
             print("\n\nMonitoring stopped by user.")
             break
+    
+    github.close()
+    telegram.close()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,29 @@
 """State management to track notified issues."""
-import json
 import os
-from typing import Set, Dict
+import sys
+import orjson
+from itertools import accumulate
+from operator import itemgetter
+from typing import Set, Dict, List, Optional
 from pathlib import Path
 
+# Version of the per-repo state format written by flush()
+STATE_VERSION = 2
+
+# Extracts an issue's number in C, for map() over issue lists
+_num = itemgetter("number")
+
+
+def _encode_deltas(issue_numbers: Set[int]) -> List[int]:
+    """Encode issue numbers as the first number followed by gaps between sorted numbers."""
+    numbers = sorted(issue_numbers)
+    return numbers[:1] + [b - a for a, b in zip(numbers, numbers[1:])]
+
+
+def _decode_deltas(deltas: List[int]) -> Set[int]:
+    """Inverse of _encode_deltas()."""
+    return set(accumulate(deltas))
+
 
 class StateManager:
     """Manages state to prevent duplicate notifications per repository."""
@@ -13,44 +33,77 @@ class StateManager:
         self.state_file = Path(state_file)
         # Track notified issues per repo: {repo: {issue_number, ...}}
         self.notified_issues: Dict[str, Set[int]] = {}
+        # ETags of the last issue listing per repo: {repo: etag}
+        self.etags: Dict[str, str] = {}
+        # Timestamp of the last successful check per repo: {repo: ISO 8601}
+        self.last_check_ts: Dict[str, str] = {}
+        # Hash of the issue numbers last processed per repo: {repo: hash}
+        self.hashes: Dict[str, int] = {}
+        # Last content written by flush(), used to skip unchanged writes
+        self._saved_content: Optional[bytes] = None
         self.load_state()
     
     def load_state(self) -> None:
         """Load state from file."""
         if self.state_file.exists():
             try:
-                with open(self.state_file, "r") as f:
-                    data = json.load(f)
+                with open(self.state_file, "rb") as f:
+                    data = orjson.loads(f.read())
                     # Support both old format (flat list) and new format (per-repo)
                     if "repos" in data:
-                        # New format: per-repo tracking
+                        # New format: per-repo tracking, delta-encoded since v2
+                        decode = _decode_deltas if data.get("v") == STATE_VERSION else set
                         self.notified_issues = {
-                            repo: set(issues) 
+                            sys.intern(repo): decode(issues) 
                             for repo, issues in data.get("repos", {}).items()
                         }
+                        self.etags = dict(data.get("etags", {}))
+                        self.last_check_ts = dict(data.get("last_check", {}))
+                        self.hashes = dict(data.get("hashes", {}))
                     else:
                         # Old format: migrate to new format
                         old_issues = set(data.get("notified_issues", []))
                         if old_issues:
                             # Migrate old state to a default repo key
                             self.notified_issues = {"_legacy": old_issues}
-            except (json.JSONDecodeError, IOError) as e:
+            except (orjson.JSONDecodeError, IOError) as e:
                 print(f"Warning: Could not load state file: {e}")
                 self.notified_issues = {}
+                self.etags = {}
+                self.last_check_ts = {}
+                self.hashes = {}
         else:
             self.notified_issues = {}
     
-    def save_state(self) -> None:
-        """Save state to file."""
+    def flush(self) -> None:
+        """
+        Save state to file if it changed since the last save.
+        
+        State changes are kept in memory until flushed, so callers flush once
+        per run instead of on every change. The file is written to a temporary
+        path first and then swapped in, so an interrupted write can't leave a
+        truncated state file behind.
+        """
+        data = {
+            "v": STATE_VERSION,
+            "repos": {
+                repo: _encode_deltas(issues) 
+                for repo, issues in self.notified_issues.items()
+            },
+            "etags": self.etags,
+            "last_check": self.last_check_ts,
+            "hashes": self.hashes,
+        }
+        content = orjson.dumps(data)
+        if content == self._saved_content:
+            return
+        
+        tmp_file = self.state_file.with_name(self.state_file.name + ".tmp")
         try:
-            data = {
-                "repos": {
-                    repo: list(issues) 
-                    for repo, issues in self.notified_issues.items()
-                }
-            }
-            with open(self.state_file, "w") as f:
-                json.dump(data, f, indent=2)
+            with open(tmp_file, "wb") as f:
+                f.write(content)
+            os.replace(tmp_file, self.state_file)
+            self._saved_content = content
         except IOError as e:
             print(f"Warning: Could not save state file: {e}")
     
@@ -61,11 +114,38 @@ class StateManager:
         return issue_number in self.notified_issues[repo]
     
     def mark_notified(self, repo: str, issue_number: int) -> None:
-        """Mark an issue as notified for a specific repo."""
+        """Mark an issue as notified for a specific repo (in memory until flush())."""
         if repo not in self.notified_issues:
             self.notified_issues[repo] = set()
         self.notified_issues[repo].add(issue_number)
-        self.save_state()
+    
+    def mark_checked(self, repo: str, timestamp: str) -> None:
+        """Record when a repo was last fetched, for incremental fetches."""
+        self.last_check_ts[repo] = timestamp
+    
+    def reset_fetch_cache(self, repo: str) -> None:
+        """Drop the cached ETag and check time so the next fetch returns the full issue list."""
+        self.etags.pop(repo, None)
+        self.last_check_ts.pop(repo, None)
+        self.hashes.pop(repo, None)
+    
+    @staticmethod
+    def hash_issue_numbers(issues: list) -> int:
+        """
+        Hash the issue numbers of a fetched issue list.
+        
+        Int and tuple hashes aren't randomized per process, so the value can
+        be persisted and compared on the next run.
+        """
+        return hash(tuple(sorted(map(_num, issues))))
+    
+    def is_unchanged(self, repo: str, issues_hash: int) -> bool:
+        """Check if a repo's fetched issues match the last processed list."""
+        return self.hashes.get(repo) == issues_hash
+    
+    def mark_processed(self, repo: str, issues_hash: int) -> None:
+        """Remember the hash of the issue list that was just processed."""
+        self.hashes[repo] = issues_hash
     
     def is_repo_initialized(self, repo: str) -> bool:
         """Check if a repository has been initialized (has any tracked issues)."""
@@ -76,12 +156,11 @@ class StateManager:
         Sync state with current issues - mark all current issues as notified.
         Used when state appears stale or on first run.
         """
-        current_issue_numbers = {issue.get("number") for issue in current_issues}
+        current_issue_numbers = set(map(_num, current_issues))
         if repo not in self.notified_issues:
             self.notified_issues[repo] = set()
         # Update to include all current issues
         self.notified_issues[repo] = current_issue_numbers
-        self.save_state()
     
     def is_state_stale(self, repo: str, current_issues: list, threshold: float = 0.5) -> bool:
         """
@@ -91,7 +170,7 @@ class StateManager:
         if repo not in self.notified_issues or len(self.notified_issues[repo]) == 0:
             return True
         
-        current_issue_numbers = {issue.get("number") for issue in current_issues}
+        current_issue_numbers = set(map(_num, current_issues))
         tracked_issues = self.notified_issues[repo]
         
         # Count how many tracked issues still exist
@@ -107,8 +186,6 @@ class StateManager:
     
     def get_new_issues(self, repo: str, issues: list) -> list:
         """Filter out issues that have already been notified for a specific repo."""
-        return [
-            issue for issue in issues
-            if not self.is_notified(repo, issue.get("number"))
-        ]
+        tracked = self.notified_issues.get(repo, frozenset())
+        return [issue for issue in issues if _num(issue) not in tracked]
 
@@ -1,7 +1,10 @@
 """Telegram bot client for sending alerts."""
+import time
+import orjson
 import requests
-from typing import Optional
-from config import Config
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, List, Tuple
 
 
 class TelegramClient:
@@ -9,11 +12,46 @@ class TelegramClient:
     
     BASE_URL = "https://api.telegram.org/bot"
     
+    # Concurrent sends per batch, well below Telegram's ~30 messages/second
+    MAX_CONCURRENT_SENDS = 5
+    
+    # Escapes text for Telegram's HTML parse mode in a single pass
+    _HTML_ESC = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+    
+    # Issue bodies are cut to this many characters in alerts
+    MAX_BODY_LENGTH = 300
+    
+    # Static parts of every issue alert
+    _HEADER = "🔔 <b>New Issue Opened</b>\n\n"
+    _REPO_PREFIX = "<b>Repository:</b> <code>"
+    
     def __init__(self, bot_token: str, chat_id: str):
         """Initialize Telegram client with bot token and chat ID."""
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.url = f"{self.BASE_URL}{bot_token}"
+        self._send_url = f"{self.url}/sendMessage"
+        # Fields shared by every sendMessage call
+        self._payload_template = {
+            "chat_id": chat_id,
+            "parse_mode": "HTML",
+            "disable_web_page_preview": False
+        }
+        
+        # Keep-alive session so repeated sends skip the TCP/TLS handshake.
+        # Only api.telegram.org is contacted, so one host pool with a
+        # connection per concurrent sender keeps bursts from queueing.
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=self.MAX_CONCURRENT_SENDS)
+        )
+        # Payloads are pre-encoded with orjson rather than passed as json=
+        self._session.headers["Content-Type"] = "application/json"
+    
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        self._session.close()
     
     def send_message(self, text: str, parse_mode: str = "HTML") -> bool:
         """
@@ -26,22 +64,85 @@ class TelegramClient:
         Returns:
             True if successful, False otherwise
         """
-        url = f"{self.url}/sendMessage"
-        payload = {
-            "chat_id": self.chat_id,
-            "text": text,
-            "parse_mode": parse_mode,
-            "disable_web_page_preview": False
-        }
+        payload = {**self._payload_template, "text": text}
+        if parse_mode != "HTML":
+            payload["parse_mode"] = parse_mode
+        return self._post_message(orjson.dumps(payload))
+    
+    def send_issue_alert(self, issue: dict, repo: str) -> bool:
+        """
+        Format an issue alert and send it to the configured chat.
+        
+        The alert text goes straight into the encoded payload bytes.
+        
+        Args:
+            issue: Issue dictionary from GitHub API
+            repo: Repository name
         
+        Returns:
+            True if successful, False otherwise
+        """
+        text = self.format_issue_alert(issue, repo)
+        return self._post_message(orjson.dumps({**self._payload_template, "text": text}))
+    
+    def _post_message(self, data: bytes) -> bool:
+        """POST an encoded sendMessage payload, returning whether it succeeded."""
         try:
-            response = requests.post(url, json=payload)
+            response = self._session.post(self._send_url, data=data, timeout=10)
+            if response.status_code == 429:
+                # Flood control during bursts: wait as long as Telegram asks, retry once
+                retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                time.sleep(retry_after)
+                response = self._session.post(self._send_url, data=data, timeout=10)
             response.raise_for_status()
             return True
         except requests.exceptions.RequestException as e:
             print(f"Error sending Telegram message: {e}")
             return False
     
+    def send_messages(self, texts: List[str]) -> List[bool]:
+        """
+        Send several messages concurrently.
+        
+        At most MAX_CONCURRENT_SENDS requests are in flight at once.
+        
+        Args:
+            texts: Message texts
+        
+        Returns:
+            Success flag for each message, in the same order as texts
+        """
+        return self._send_concurrently(self.send_message, texts)
+    
+    def send_issue_alerts(self, alerts: List[Tuple[str, dict]]) -> List[bool]:
+        """
+        Format and send several issue alerts concurrently.
+        
+        Args:
+            alerts: List of (repo, issue) pairs
+        
+        Returns:
+            Success flag for each alert, in the same order as alerts
+        """
+        return self._send_concurrently(lambda alert: self.send_issue_alert(alert[1], alert[0]), alerts)
+    
+    def _send_concurrently(self, send: Callable[[Any], bool], items: list) -> List[bool]:
+        """Call send() for each item on a thread pool, returning success flags in order."""
+        if not items:
+            return []
+        
+        def send_one(item) -> bool:
+            # A bad item must not abort the rest of the batch
+            try:
+                return send(item)
+            except Exception as e:
+                print(f"Error sending Telegram message: {e}")
+                return False
+        
+        workers = min(len(items), self.MAX_CONCURRENT_SENDS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(send_one, items))
+    
     def format_issue_alert(self, issue: dict, repo: str) -> str:
         """
         Format a GitHub issue as a Telegram message with clickable link.
@@ -53,41 +154,57 @@ class TelegramClient:
         Returns:
             Formatted message string with HTML formatting
         """
-        title = issue.get("title", "Untitled")
-        number = issue.get("number", "?")
-        url = issue.get("html_url", "")
-        author = issue.get("user", {}).get("login", "Unknown")
-        body = issue.get("body", "")
-        labels = issue.get("labels", [])
-        
-        # Truncate body if too long
-        if body and len(body) > 300:
-            body = body[:300] + "..."
-        
-        # Format labels if present
-        label_text = ""
-        if labels:
-            label_names = [label.get("name", "") for label in labels[:5]]  # Max 5 labels
-            label_text = " ".join([f"#{label}" for label in label_names if label])
-        
-        message = f"🔔 <b>New Issue Opened</b>\n\n"
-        message += f"<b>Repository:</b> <code>{repo}</code>\n"
-        message += f"<b>Author:</b> {author}\n"
-        message += f"<b>Issue #{number}:</b> {title}\n"
+        # GitHub always sends these fields, so index directly and only fall
+        # back to defaults for partial issue dicts
+        try:
+            title = issue["title"]
+            number = issue["number"]
+            url = issue["html_url"]
+            author = issue["user"]["login"]
+            body = issue["body"]
+            labels = issue["labels"]
+        except (KeyError, TypeError):
+            title = issue.get("title", "Untitled")
+            number = issue.get("number", "?")
+            url = issue.get("html_url", "")
+            author = (issue.get("user") or {}).get("login", "Unknown")
+            body = issue.get("body", "")
+            labels = issue.get("labels", [])
+        
+        # Escape HTML in user-provided text to prevent formatting issues
+        title = title.translate(self._HTML_ESC)
+        author = author.translate(self._HTML_ESC)
+        
+        # Truncate body if too long. It is already a decoded str, so len() is
+        # O(1) and the slice copies at most MAX_BODY_LENGTH whole code points.
+        if body and len(body) > self.MAX_BODY_LENGTH:
+            body = body[:self.MAX_BODY_LENGTH] + "..."
+        
+        # Format labels if present (max 5 labels)
+        label_text = " ".join(
+            f"#{name}" for name in (label.get("name") for label in labels[:5]) if name
+        ).translate(self._HTML_ESC)
+        
+        # Collect the sections and join once instead of growing a string
+        parts = [
+            self._HEADER,
+            f"{self._REPO_PREFIX}{repo}</code>\n",
+            f"<b>Author:</b> {author}\n",
+            f"<b>Issue #{number}:</b> {title}\n",
+        ]
         
         if label_text:
-            message += f"<b>Labels:</b> {label_text}\n"
+            parts.append(f"<b>Labels:</b> {label_text}\n")
         
-        message += "\n"
+        parts.append("\n")
         
         if body:
-            # Escape HTML in body to prevent formatting issues
-            body_escaped = body.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            message += f"<b>Description:</b>\n{body_escaped}\n\n"
+            # Body is already truncated, so escaping is bounded by MAX_BODY_LENGTH
+            parts.append(f"<b>Description:</b>\n{body.translate(self._HTML_ESC)}\n\n")
         
         # Make the link prominent and clickable
-        message += f"🔗 <a href='{url}'><b>View Issue on GitHub →</b></a>\n"
-        message += f"<code>{url}</code>"
+        parts.append(f"🔗 <a href='{url}'><b>View Issue on GitHub →</b></a>\n")
+        parts.append(f"<code>{url}</code>")
         
-        return message
+        return "".join(parts)
 
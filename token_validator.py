@@ -1,13 +1,90 @@
 """GitHub token validation and scope checking."""
+import hashlib
+import threading
+import time
 import requests
-from typing import Optional, Dict, List
-from github_client import GitHubError
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from types import MappingProxyType
+from typing import Optional, Dict, List, Mapping, Tuple
 
+# Shared keep-alive session so the /user, /rate_limit and /repos calls reuse
+# one connection to api.github.com. Created on first use, not at import.
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
 
-def validate_token(token: str) -> tuple[bool, Dict]:
+
+def _get_session() -> requests.Session:
+    """Return the shared session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # Retries honor Retry-After on 429s
+            session.mount(
+                "https://",
+                HTTPAdapter(
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.3,
+                        status_forcelist=(429, 502, 503, 504),
+                        respect_retry_after_header=True,
+                        raise_on_status=False,
+                    ),
+                    pool_maxsize=10,
+                )
+            )
+            _session = session
+        return _session
+
+
+# validate_token() results: {sha256(token): (expires_at, is_valid, info)}.
+# Keyed by digest so the token itself is never kept in memory here. Held
+# while validating, so concurrent callers wait for one result instead of
+# each querying GitHub.
+_TOKEN_CACHE_TTL = 300
+_TOKEN_CACHE_MAXSIZE = 8
+_token_cache: Dict[str, Tuple[float, bool, Mapping]] = {}
+_token_cache_lock = threading.Lock()
+
+# Error reported for a rejected token; the only failure worth caching
+_INVALID_TOKEN_ERROR = "Token is invalid or expired"
+
+
+def _token_key(token: str) -> str:
+    """Return the cache key for a token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def invalidate_token_cache(token: str) -> None:
+    """Forget a cached validation, e.g. after a 401 shows the token was revoked."""
+    with _token_cache_lock:
+        _token_cache.pop(_token_key(token), None)
+
+
+def _auth_headers(token: str) -> Dict[str, str]:
+    """Build GitHub API request headers for a token."""
+    return {
+        "Authorization": f"token {token}",
+        "Accept": "application/vnd.github.v3+json",
+    }
+
+
+def _parse_scopes(response: requests.Response) -> List[str]:
+    """Read the token scopes GitHub reports on every authenticated response."""
+    scopes_header = response.headers.get("X-OAuth-Scopes", "")
+    return [s.strip() for s in scopes_header.split(",")] if scopes_header else []
+
+
+def validate_token(token: str) -> tuple[bool, Mapping]:
     """
     Validate GitHub token and check its scopes.
     
+    Successful results and rejected tokens are cached for five minutes, so
+    repeated checks don't repeat the /user and /rate_limit requests. Network
+    and other API errors are not cached. Cached info is read-only.
+    
     Returns:
         (is_valid, info_dict) where info_dict contains:
         - scopes: List of token scopes
@@ -15,17 +92,41 @@ def validate_token(token: str) -> tuple[bool, Dict]:
         - user: GitHub username
         - rate_limit: Current rate limit info
     """
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    key = _token_key(token)
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1], cached[2]
+        
+        is_valid, info = _fetch_token_info(token)
+        if is_valid or info.get("error") == _INVALID_TOKEN_ERROR:
+            info = MappingProxyType(info)
+            if key not in _token_cache and len(_token_cache) >= _TOKEN_CACHE_MAXSIZE:
+                # Evict the entry closest to expiry
+                del _token_cache[min(_token_cache, key=lambda k: _token_cache[k][0])]
+            _token_cache[key] = (time.monotonic() + _TOKEN_CACHE_TTL, is_valid, info)
+        return is_valid, info
+
+
+def _fetch_token_info(token: str) -> tuple[bool, Dict]:
+    """Query GitHub for the token's user, scopes and rate limit."""
+    headers = _auth_headers(token)
+    session = _get_session()
     
-    # Check token validity and get user info
+    # Check token validity and get user info, fetching the rate limit
+    # concurrently so both requests share a single round-trip of wait time
     try:
-        response = requests.get("https://api.github.com/user", headers=headers, timeout=10)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            user_future = executor.submit(
+                session.get, "https://api.github.com/user", headers=headers, timeout=10
+            )
+            rate_limit_future = executor.submit(
+                session.get, "https://api.github.com/rate_limit", headers=headers, timeout=10
+            )
+        response = user_future.result()
         
         if response.status_code == 401:
-            return False, {"error": "Token is invalid or expired"}
+            return False, {"error": _INVALID_TOKEN_ERROR}
         
         if not response.ok:
             return False, {"error": f"API error: {response.status_code}"}
@@ -33,11 +134,10 @@ def validate_token(token: str) -> tuple[bool, Dict]:
         user_data = response.json()
         
         # Get token scopes from response headers
-        scopes_header = response.headers.get("X-OAuth-Scopes", "")
-        scopes = [s.strip() for s in scopes_header.split(",")] if scopes_header else []
+        scopes = _parse_scopes(response)
         
         # Check rate limit
-        rate_limit_response = requests.get("https://api.github.com/rate_limit", headers=headers, timeout=10)
+        rate_limit_response = rate_limit_future.result()
         rate_limit_data = rate_limit_response.json() if rate_limit_response.ok else {}
         
         has_repo_scope = "repo" in scopes
@@ -58,29 +158,36 @@ def check_private_repo_access(token: str, repo: str) -> tuple[bool, str]:
     """
     Check if token can access a specific private repository.
     
+    Makes a single request: token scopes are read from the repo response's
+    headers, and validate_token() only runs on a 401 to explain the failure.
+    The diagnosis is cached, so a revoked token is validated once rather
+    than once per repo.
+    
     Returns:
         (can_access, message)
     """
-    is_valid, info = validate_token(token)
-    
-    if not is_valid:
-        return False, f"Token validation failed: {info.get('error', 'Unknown error')}"
-    
-    if not info.get("has_repo_scope"):
-        return False, (
-            f"Token does not have 'repo' scope required for private repositories. "
-            f"Current scopes: {', '.join(info.get('scopes', [])) or 'none'}. "
-            f"Please regenerate your token with 'repo' scope."
-        )
-    
-    # Try to access the repo
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    headers = _auth_headers(token)
     
     try:
-        response = requests.get(f"https://api.github.com/repos/{repo}", headers=headers, timeout=10)
+        response = _get_session().get(f"https://api.github.com/repos/{repo}", headers=headers, timeout=10)
+        
+        if response.status_code == 401:
+            is_valid, info = validate_token(token)
+            if is_valid:
+                # Cached before the token was revoked; ask GitHub again
+                invalidate_token_cache(token)
+                is_valid, info = validate_token(token)
+            if not is_valid:
+                return False, f"Token validation failed: {info.get('error', 'Unknown error')}"
+            return False, f"Authentication failed for '{repo}'. Check your GitHub token."
+        
+        scopes = _parse_scopes(response)
+        if "repo" not in scopes:
+            return False, (
+                f"Token does not have 'repo' scope required for private repositories. "
+                f"Current scopes: {', '.join(scopes) or 'none'}. "
+                f"Please regenerate your token with 'repo' scope."
+            )
         
         if response.status_code == 404:
             return False, f"Repository '{repo}' not found or you don't have access"
@@ -95,3 +202,19 @@ def check_private_repo_access(token: str, repo: str) -> tuple[bool, str]:
     except requests.exceptions.RequestException as e:
         return False, f"Network error: {str(e)}"
 
+
+def check_many_private_repo_access(token: str, repos: List[str]) -> List[Tuple[str, bool, str]]:
+    """
+    Check access to several repositories concurrently.
+    
+    Runs check_private_repo_access() for each repo over the shared session,
+    with at most 10 requests in flight to respect GitHub's secondary limits.
+    
+    Returns:
+        List of (repo, can_access, message) in the same order as repos
+    """
+    if not repos:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(repos), 10)) as executor:
+        results = executor.map(lambda repo: check_private_repo_access(token, repo), repos)
+        return [(repo, can_access, message) for repo, (can_access, message) in zip(repos, results)]